@@ -0,0 +1 @@
+Added the projectsEnrichmentConcurrency and projectsResyncBatchSize configurations to tune the projects resync concurrency independently from the batch size sent to Port
@@ -1,4 +1,10 @@
+import asyncio
 import fnmatch
+from typing import Any, AsyncIterator, Iterable, TypeVar
+
+T = TypeVar("T")
+
+_DRAINED = object()
 
 
 def _match(pattern_parts: list[str], string_parts: list[str]) -> bool:
@@ -33,3 +39,51 @@ def does_pattern_apply(pattern: str | list[str], string: str) -> bool:
 
 def generate_ref(branch_name: str) -> str:
     return f"refs/heads/{branch_name}"
+
+
+async def merge_async_gens(
+    gens: Iterable[AsyncIterator[T]], concurrency: int
+) -> AsyncIterator[T]:
+    """
+    Drains the given async generators concurrently and yields their items in the order they are produced.
+    At most `concurrency` generators are advanced at the same time, and the internal queue is bounded so a slow
+    consumer applies backpressure on the producers.
+    An exception raised by any of the generators is re-raised to the consumer and the remaining generators are
+    cancelled.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency * 2)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def drain(gen: AsyncIterator[T]) -> None:
+        try:
+            iterator = aiter(gen)
+            while True:
+                async with semaphore:
+                    try:
+                        item = await anext(iterator)
+                    except StopAsyncIteration:
+                        break
+                await queue.put((item,))
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_DRAINED)
+
+    tasks = [asyncio.create_task(drain(gen)) for gen in gens]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            result = await queue.get()
+            if result is _DRAINED:
+                remaining -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
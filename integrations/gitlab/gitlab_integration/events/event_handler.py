@@ -16,8 +16,8 @@ class EventHandler:
         for event in events:
             self._observers[event].append(observer)
 
-    async def notify(self, event: str, body: dict[str, Any]) -> Awaitable[Any]:
-        return asyncio.gather(
+    async def notify(self, event: str, body: dict[str, Any]) -> list[Any]:
+        return await asyncio.gather(
             *(observer(event, body) for observer in self._observers.get(event, []))
         )
 
@@ -34,10 +34,10 @@ class SystemEventHandler:
     def add_client(self, client: GitlabService) -> None:
         self._clients.append(client)
 
-    async def notify(self, event: str, body: dict[str, Any]) -> Awaitable[Any]:
+    async def notify(self, event: str, body: dict[str, Any]) -> list[Any]:
         # best effort to notify using all clients, as we don't know which one of the clients have the permission to
         # access the project
-        return asyncio.gather(
+        return await asyncio.gather(
             *(
                 hook_handler(client).on_hook(event, body)
                 for client in self._clients
@@ -0,0 +1,62 @@
+import asyncio
+import contextvars
+from typing import Any
+
+from fastapi import HTTPException
+from loguru import logger
+from port_ocean.context.event import event_context, EventType
+from port_ocean.context.ocean import ocean
+
+from gitlab_integration.events.event_handler import EventHandler, SystemEventHandler
+
+WEBHOOK_EVENTS_QUEUE_SIZE = 1000
+WEBHOOK_EVENTS_WORKERS = 10
+
+# Gitlab times out webhooks after 10 seconds and retries them, and an event may fan out to several api calls, so the
+# hooks are answered once the event is queued and handled here in the background. Gitlab gets a 503 when the queue is
+# full, and a webhook that fails too many times is disabled by gitlab until it is re-enabled in the group settings.
+# Events still in the queue when the integration shuts down are lost, the next resync reconciles them.
+webhook_events_queue: asyncio.Queue[
+    tuple[EventHandler | SystemEventHandler, str, dict[str, Any]]
+] = asyncio.Queue(maxsize=WEBHOOK_EVENTS_QUEUE_SIZE)
+# asyncio only keeps weak references to tasks
+webhook_events_workers: list[asyncio.Task[None]] = []
+
+
+async def process_webhook_events() -> None:
+    while True:
+        handler, event_id, body = await webhook_events_queue.get()
+        try:
+            async with event_context(EventType.HTTP_REQUEST, trigger_type="request"):
+                await ocean.integration.port_app_config_handler.get_port_app_config()
+                with logger.contextualize(event_id=event_id):
+                    await handler.notify(event_id, body)
+        except Exception:
+            logger.exception(f"Failed to handle webhook event {event_id}")
+        finally:
+            webhook_events_queue.task_done()
+
+
+def start_webhook_events_workers() -> None:
+    # the workers are started from the on_start listener, and a task inherits the context it is created in. Running
+    # them in an empty context keeps the START event from becoming the parent of every webhook event, as it has no
+    # port app config for them to inherit.
+    webhook_events_workers.extend(
+        asyncio.create_task(process_webhook_events(), context=contextvars.Context())
+        for _ in range(WEBHOOK_EVENTS_WORKERS)
+    )
+
+
+def enqueue_webhook_event(
+    handler: EventHandler | SystemEventHandler, event_id: str, body: dict[str, Any]
+) -> None:
+    try:
+        webhook_events_queue.put_nowait((handler, event_id, body))
+    except asyncio.QueueFull:
+        logger.warning(
+            f"{webhook_events_queue.qsize()} webhook events are waiting to be handled, rejecting {event_id}"
+        )
+        raise HTTPException(
+            status_code=503,
+            detail={"ok": False, "message": "Webhook events backlog is full"},
+        )
@@ -1,5 +1,6 @@
 import asyncio
 import typing
+from functools import cached_property
 from datetime import datetime, timedelta
 from typing import List, Tuple, Any, Union, TYPE_CHECKING
 
@@ -26,6 +27,7 @@ from port_ocean.context.event import event
 from port_ocean.core.models import Entity
 
 PROJECTS_CACHE_KEY = "__cache_all_projects"
+PROJECTS_PAGES_CACHE_KEY = "__cache_all_projects_pages"
 
 if TYPE_CHECKING:
     from gitlab_integration.git_integration import (
@@ -44,6 +46,10 @@ class GitlabService:
         self.app_host = app_host
         self.group_mapping = group_mapping
 
+    @cached_property
+    def masked_token(self) -> str:
+        return max(0, len(str(self.gitlab_client.private_token)) - 4) * "*"
+
     def _is_exists(self, group: RESTObject) -> bool:
         for hook in group.hooks.list(iterator=True):
             if hook.url == f"{self.app_host}/integration/hook/{group.get_id()}":
@@ -239,22 +245,23 @@ class GitlabService:
         :return: Project if it should be processed, None otherwise
         """
         logger.info(f"fetching project {project_id}")
-        filtered_projects = event.attributes.setdefault(
-            PROJECTS_CACHE_KEY, {}
-        ).setdefault(self.gitlab_client.private_token, {})
-
-        if project := filtered_projects.get(project_id):
+        if project := self._get_cached_projects().get(project_id):
             return project
 
         project = self.gitlab_client.projects.get(project_id)
         if self.should_run_for_project(project):
-            event.attributes[PROJECTS_CACHE_KEY][self.gitlab_client.private_token][
-                project_id
-            ] = project
+            self._get_cached_projects()[project_id] = project
             return project
         else:
             return None
 
+    def _get_cached_projects(self) -> dict[int, Project]:
+        # looked up on every access, as the cache of all the tokens is reset when a project is missing from it (see
+        # _get_project_from_cache), possibly while this token's projects are still being listed
+        return event.attributes.setdefault(PROJECTS_CACHE_KEY, {}).setdefault(
+            self.gitlab_client.private_token, {}
+        )
+
     def get_group(self, group_id: int) -> Group | None:
         logger.info(f"fetching group {group_id}")
         group = self.gitlab_client.groups.get(group_id)
@@ -285,15 +292,19 @@ class GitlabService:
             "GitlabPortAppConfig", event.port_app_config
         )
 
-        async_fetcher = AsyncFetcher(self.gitlab_client)
-        cached_projects = event.attributes.setdefault(
-            PROJECTS_CACHE_KEY, {}
-        ).setdefault(self.gitlab_client.private_token, {})
-
-        if cached_projects:
-            yield cached_projects.values()
+        # the projects pages are shared by all the kinds of the same resync, and only cached once they were all
+        # fetched, so a partially consumed listing is never mistaken for the full one
+        cached_projects_pages = event.attributes.get(PROJECTS_PAGES_CACHE_KEY, {}).get(
+            self.gitlab_client.private_token
+        )
+        if cached_projects_pages is not None:
+            logger.info("Picking projects from cache")
+            for projects_page in cached_projects_pages:
+                yield projects_page
             return
 
+        async_fetcher = AsyncFetcher(self.gitlab_client)
+        projects_pages: List[List[Project]] = []
         async for projects_batch in async_fetcher.fetch(
             fetch_func=self.gitlab_client.projects.list,
             validation_func=self.should_run_for_project,
@@ -308,12 +319,16 @@ class GitlabService:
             logger.info(
                 f"Queried {len(projects)} projects {[project.path_with_namespace for project in projects]}"
             )
-            cached_projects = event.attributes[PROJECTS_CACHE_KEY][
-                self.gitlab_client.private_token
-            ]
-            cached_projects.update({project.id: project for project in projects})
+            self._get_cached_projects().update(
+                {project.id: project for project in projects}
+            )
+            projects_pages.append(projects)
             yield projects
 
+        event.attributes.setdefault(PROJECTS_PAGES_CACHE_KEY, {})[
+            self.gitlab_client.private_token
+        ] = projects_pages
+
     @classmethod
     async def async_project_language_wrapper(cls, project: Project) -> dict[str, Any]:
         try:
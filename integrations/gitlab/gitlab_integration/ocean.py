@@ -1,41 +1,70 @@
 import asyncio
-import typing
 from datetime import datetime, timedelta
-from itertools import islice
+from operator import methodcaller
 from typing import Any
 
+import orjson
+from gitlab.v4.objects import Project
+from fastapi import HTTPException
 from loguru import logger
 from starlette.requests import Request
 from port_ocean.context.event import event
 
 from gitlab_integration.bootstrap import event_handler, system_event_handler
 from gitlab_integration.bootstrap import setup_application
-from gitlab_integration.git_integration import GitlabResourceConfig
-from gitlab_integration.utils import ObjectKind, get_cached_all_services
+from gitlab_integration.events.webhook_queue import (
+    enqueue_webhook_event,
+    start_webhook_events_workers,
+)
+from gitlab_integration.core.utils import merge_async_gens
+from gitlab_integration.git_integration import GitlabResourceConfig, GitlabSelector
+from gitlab_integration.gitlab_service import GitlabService
+from gitlab_integration.utils import (
+    ObjectKind,
+    get_cached_all_services,
+    get_positive_int_config,
+)
 from port_ocean.context.ocean import ocean
 from port_ocean.core.ocean_types import ASYNC_GENERATOR_RESYNC_TYPE
 
 NO_WEBHOOK_WARNING = "Without setting up the webhook, the integration will not export live changes from the gitlab"
-PROJECT_RESYNC_BATCH_SIZE = 10
+SERVICES_RESYNC_CONCURRENCY = 10
+
+as_dict = methodcaller("asdict")
+
+
+async def _read_hook_body(request: Request) -> dict[str, Any]:
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=400, detail={"ok": False, "message": "Invalid JSON body"}
+        )
+    if not isinstance(body, dict):
+        raise HTTPException(
+            status_code=422,
+            detail={"ok": False, "message": "Hook body must be a JSON object"},
+        )
+    return body
 
 
 @ocean.router.post("/hook/{group_id}")
 async def handle_webhook(group_id: str, request: Request) -> dict[str, Any]:
     event_id = f'{request.headers.get("X-Gitlab-Event")}:{group_id}'
     with logger.contextualize(event_id=event_id):
-        body = await request.json()
-        await event_handler.notify(event_id, body)
+        body = await _read_hook_body(request)
+        enqueue_webhook_event(event_handler, event_id, body)
         return {"ok": True}
 
 
 @ocean.router.post("/system/hook")
 async def handle_system_webhook(request: Request) -> dict[str, Any]:
-    body = await request.json()
+    body = await _read_hook_body(request)
     # some system hooks have event_type instead of event_name in the body, such as merge_request events
     event_name = body.get("event_name") or body.get("event_type")
     with logger.contextualize(event_name=event_name):
         logger.debug("Handling system hook")
-        await system_event_handler.notify(event_name, body)
+        enqueue_webhook_event(system_event_handler, event_name, body)
         return {"ok": True}
 
 
@@ -45,6 +74,8 @@ async def on_start() -> None:
         logger.info("Skipping webhook creation because the event listener is ONCE")
         return
 
+    start_webhook_events_workers()
+
     logic_settings = ocean.integration_config
     if not logic_settings.get("app_host"):
         logger.warning(
@@ -66,104 +97,209 @@ async def on_start() -> None:
         )
 
 
+async def _get_groups(service: GitlabService) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    async for groups_batch in service.get_all_groups():
+        yield list(map(as_dict, groups_batch))
+
+
+async def _get_projects(
+    service: GitlabService, semaphore: asyncio.Semaphore
+) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    logger.info(f"fetching projects for token {service.masked_token}")
+    resync_batch_size = get_positive_int_config("projects_resync_batch_size")
+
+    async def enrich_project(project: Project) -> dict[str, Any]:
+        async with semaphore:
+            return await service.enrich_project_with_extras(project)
+
+    async for projects in service.get_all_projects():
+        # resync small batches of projects, so data will appear asap to the user.
+        # projects takes more time than other resources as it has extra enrichment performed for each entity
+        # such as languages, `file://` and `search://`.
+        # enriched projects are yielded as soon as they are ready, so a slow enrichment doesn't hold back the others
+        tasks = [asyncio.create_task(enrich_project(project)) for project in projects]
+        enriched_projects = []
+        projects_processed_in_full_batch = 0
+        try:
+            for enriched_project in asyncio.as_completed(tasks):
+                enriched_projects.append(await enriched_project)
+                projects_processed_in_full_batch += 1
+                is_last_project = projects_processed_in_full_batch == len(tasks)
+                if len(enriched_projects) >= resync_batch_size or is_last_project:
+                    logger.opt(lazy=True).info(
+                        "Finished Processing extras for {}/{} projects in batch",
+                        lambda: projects_processed_in_full_batch,
+                        lambda: len(tasks),
+                    )
+                    yield enriched_projects
+                    enriched_projects = []
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def _get_folders(
+    service: GitlabService, selector: GitlabSelector
+) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    projects_concurrency = get_positive_int_config("projects_resync_concurrency")
+    folder_selectors_repos = [
+        (folder_selector, set(folder_selector.repos))
+        for folder_selector in selector.folders
+    ]
+    wanted_repos = frozenset().union(*(repos for _, repos in folder_selectors_repos))
+    async for projects_batch in service.get_all_projects():
+        matching_projects = [
+            project for project in projects_batch if project.name in wanted_repos
+        ]
+        if not matching_projects:
+            continue
+        async for folders_batch in merge_async_gens(
+            (
+                service.get_all_folders_in_project_path(project, folder_selector)
+                for folder_selector, repos in folder_selectors_repos
+                for project in matching_projects
+                if project.name in repos
+            ),
+            projects_concurrency,
+        ):
+            yield folders_batch
+
+
+async def _get_merge_requests(
+    service: GitlabService, updated_after: datetime
+) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    for group in service.get_root_groups():
+        async for merge_request_batch in service.get_opened_merge_requests(group):
+            yield list(map(as_dict, merge_request_batch))
+        async for merge_request_batch in service.get_closed_merge_requests(
+            group, updated_after
+        ):
+            yield list(map(as_dict, merge_request_batch))
+
+
+async def _get_issues(service: GitlabService) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    for group in service.get_root_groups():
+        async for issues_batch in service.get_all_issues(group):
+            yield list(map(as_dict, issues_batch))
+
+
+async def _get_project_jobs(
+    service: GitlabService, project: Project
+) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    async for jobs_batch in service.get_all_jobs(project):
+        yield list(map(as_dict, jobs_batch))
+
+
+async def _get_jobs(service: GitlabService) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    projects_concurrency = get_positive_int_config("projects_resync_concurrency")
+    async for projects_batch in service.get_all_projects():
+        async for jobs_batch in merge_async_gens(
+            (_get_project_jobs(service, project) for project in projects_batch),
+            projects_concurrency,
+        ):
+            yield jobs_batch
+
+
+async def _get_project_pipelines(
+    service: GitlabService, project: Project
+) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    logger.opt(lazy=True).info(
+        "Fetching pipelines for project {}", lambda: project.path_with_namespace
+    )
+    # serialized once per project and shared by all of its pipelines, as it is only read downstream
+    project_dict = project.asdict()
+    async for pipelines_batch in service.get_all_pipelines(project):
+        logger.opt(lazy=True).info(
+            "Found {} pipelines for project {}",
+            lambda: len(pipelines_batch),
+            lambda: project.path_with_namespace,
+        )
+        yield [
+            {**pipeline.asdict(), "__project": project_dict}
+            for pipeline in pipelines_batch
+        ]
+
+
+async def _get_pipelines(service: GitlabService) -> ASYNC_GENERATOR_RESYNC_TYPE:
+    projects_concurrency = get_positive_int_config("projects_resync_concurrency")
+    async for projects_batch in service.get_all_projects():
+        async for pipelines_batch in merge_async_gens(
+            (_get_project_pipelines(service, project) for project in projects_batch),
+            projects_concurrency,
+        ):
+            yield pipelines_batch
+
+
+# Each token is resynced concurrently, so a slow token doesn't hold back the others
 @ocean.on_resync(ObjectKind.GROUP)
 async def resync_groups(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        async for groups_batch in service.get_all_groups():
-            yield [group.asdict() for group in groups_batch]
+    async for groups_batch in merge_async_gens(
+        map(_get_groups, get_cached_all_services()), SERVICES_RESYNC_CONCURRENCY
+    ):
+        yield groups_batch
 
 
 @ocean.on_resync(ObjectKind.PROJECT)
 async def on_resync(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        masked_token = len(str(service.gitlab_client.private_token)[:-4]) * "*"
-        logger.info(f"fetching projects for token {masked_token}")
-        async for projects in service.get_all_projects():
-            # resync small batches of projects, so data will appear asap to the user.
-            # projects takes more time than other resources as it has extra enrichment performed for each entity
-            # such as languages, `file://` and `search://`
-            projects_batch_iter = iter(projects)
-            projects_processed_in_full_batch = 0
-            while projects_batch := tuple(
-                islice(projects_batch_iter, PROJECT_RESYNC_BATCH_SIZE)
-            ):
-                projects_processed_in_full_batch += len(projects_batch)
-                logger.info(
-                    f"Processing extras for {projects_processed_in_full_batch}/{len(projects)} projects in batch"
-                )
-                tasks = []
-                for project in projects_batch:
-                    tasks.append(service.enrich_project_with_extras(project))
-                enriched_projects = await asyncio.gather(*tasks)
-                logger.info(
-                    f"Finished Processing extras for {projects_processed_in_full_batch}/{len(projects)} projects in batch"
-                )
-                yield enriched_projects
+    # the enrichment semaphore is shared by all the tokens, as they all hit the same gitlab instance
+    semaphore = asyncio.Semaphore(
+        get_positive_int_config("projects_enrichment_concurrency")
+    )
+    async for projects_batch in merge_async_gens(
+        (_get_projects(service, semaphore) for service in get_cached_all_services()),
+        SERVICES_RESYNC_CONCURRENCY,
+    ):
+        yield projects_batch
 
 
 @ocean.on_resync(ObjectKind.FOLDER)
 async def resync_folders(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        gitlab_resource_config: GitlabResourceConfig = typing.cast(
-            "GitlabResourceConfig", event.resource_config
-        )
-        if not isinstance(gitlab_resource_config, GitlabResourceConfig):
-            return
-        selector = gitlab_resource_config.selector
-        async for projects_batch in service.get_all_projects():
-            for folder_selector in selector.folders:
-                for project in projects_batch:
-                    if project.name in folder_selector.repos:
-                        async for folders_batch in service.get_all_folders_in_project_path(
-                            project, folder_selector
-                        ):
-                            yield folders_batch
+    gitlab_resource_config = event.resource_config
+    if not isinstance(gitlab_resource_config, GitlabResourceConfig):
+        return
+    selector = gitlab_resource_config.selector
+    if not selector.folders:
+        return
+    async for folders_batch in merge_async_gens(
+        (_get_folders(service, selector) for service in get_cached_all_services()),
+        SERVICES_RESYNC_CONCURRENCY,
+    ):
+        yield folders_batch
 
 
 @ocean.on_resync(ObjectKind.MERGE_REQUEST)
 async def resync_merge_requests(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
     updated_after = datetime.now() - timedelta(days=14)
 
-    for service in get_cached_all_services():
-        for group in service.get_root_groups():
-            async for merge_request_batch in service.get_opened_merge_requests(group):
-                yield [merge_request.asdict() for merge_request in merge_request_batch]
-            async for merge_request_batch in service.get_closed_merge_requests(
-                group, updated_after
-            ):
-                yield [merge_request.asdict() for merge_request in merge_request_batch]
+    async for merge_request_batch in merge_async_gens(
+        (
+            _get_merge_requests(service, updated_after)
+            for service in get_cached_all_services()
+        ),
+        SERVICES_RESYNC_CONCURRENCY,
+    ):
+        yield merge_request_batch
 
 
 @ocean.on_resync(ObjectKind.ISSUE)
 async def resync_issues(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        for group in service.get_root_groups():
-            async for issues_batch in service.get_all_issues(group):
-                yield [issue.asdict() for issue in issues_batch]
+    async for issues_batch in merge_async_gens(
+        map(_get_issues, get_cached_all_services()), SERVICES_RESYNC_CONCURRENCY
+    ):
+        yield issues_batch
 
 
 @ocean.on_resync(ObjectKind.JOB)
 async def resync_jobs(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        async for projects_batch in service.get_all_projects():
-            for project in projects_batch:
-                async for jobs_batch in service.get_all_jobs(project):
-                    yield [job.asdict() for job in jobs_batch]
+    async for jobs_batch in merge_async_gens(
+        map(_get_jobs, get_cached_all_services()), SERVICES_RESYNC_CONCURRENCY
+    ):
+        yield jobs_batch
 
 
 @ocean.on_resync(ObjectKind.PIPELINE)
 async def resync_pipelines(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
-    for service in get_cached_all_services():
-        async for projects_batch in service.get_all_projects():
-            for project in projects_batch:
-                logger.info(
-                    f"Fetching pipelines for project {project.path_with_namespace}"
-                )
-                async for pipelines_batch in service.get_all_pipelines(project):
-                    logger.info(
-                        f"Found {len(pipelines_batch)} pipelines for project {project.path_with_namespace}"
-                    )
-                    yield [
-                        {**pipeline.asdict(), "__project": project.asdict()}
-                        for pipeline in pipelines_batch
-                    ]
+    async for pipelines_batch in merge_async_gens(
+        map(_get_pipelines, get_cached_all_services()), SERVICES_RESYNC_CONCURRENCY
+    ):
+        yield pipelines_batch
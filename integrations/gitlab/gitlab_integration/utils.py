@@ -38,6 +38,16 @@ def get_cached_all_services() -> List[GitlabService]:
         return get_all_services()
 
 
+def get_positive_int_config(key: str) -> int:
+    value = ocean.integration_config[key]
+    if value < 1:
+        logger.warning(
+            f"Invalid value {value} for the {key} configuration, it must be at least 1. Using 1 instead"
+        )
+        return 1
+    return value
+
+
 class ObjectKind:
     GROUP = "group"
     ISSUE = "issue"
@@ -0,0 +1,33 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from port_ocean.context.event import event_context, EventType
+
+from gitlab_integration.events import webhook_queue
+
+
+async def _handle_webhook_event_started_from_start_event() -> AsyncMock:
+    handler = MagicMock()
+    handler.notify = AsyncMock()
+
+    # ocean runs the on_start listeners inside the START event, which has no port app config
+    async with event_context(EventType.START, trigger_type="machine"):
+        webhook_queue.start_webhook_events_workers()
+
+    webhook_queue.enqueue_webhook_event(handler, "Push Hook:1", {"project": 1})
+    await asyncio.wait_for(webhook_queue.webhook_events_queue.join(), timeout=5)
+
+    for worker in webhook_queue.webhook_events_workers:
+        worker.cancel()
+    await asyncio.gather(*webhook_queue.webhook_events_workers, return_exceptions=True)
+    webhook_queue.webhook_events_workers.clear()
+    return handler.notify
+
+
+def test_queued_webhook_event_is_handled() -> None:
+    ocean = MagicMock()
+    ocean.integration.port_app_config_handler.get_port_app_config = AsyncMock()
+    with patch.object(webhook_queue, "ocean", ocean):
+        notify = asyncio.run(_handle_webhook_event_started_from_start_event())
+
+    notify.assert_awaited_once_with("Push Hook:1", {"project": 1})
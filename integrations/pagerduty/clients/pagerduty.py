@@ -15,9 +15,8 @@ class PagerDutyClient:
         self.http_client = http_async_client
         self.http_client.headers.update(self.api_auth_param["headers"])
 
-    @property
-    def incident_upsert_events(self) -> list[str]:
-        return [
+    incident_upsert_events: frozenset[str] = frozenset(
+        {
             "incident.acknowledged",
             "incident.annotated",
             "incident.delegated",
@@ -31,27 +30,26 @@ class PagerDutyClient:
             "incident.responder.replied",
             "incident.triggered",
             "incident.unacknowledged",
-        ]
-
-    @property
-    def service_upsert_events(self) -> list[str]:
-        return [
+        }
+    )
+    service_upsert_events: frozenset[str] = frozenset(
+        {
             "service.created",
             "service.updated",
-        ]
-
-    @property
-    def service_delete_events(self) -> list[str]:
-        return [
+        }
+    )
+    service_delete_events: frozenset[str] = frozenset(
+        {
             "service.deleted",
-        ]
+        }
+    )
 
     @property
     def all_events(self) -> list[str]:
-        return (
+        return sorted(
             self.incident_upsert_events
-            + self.service_upsert_events
-            + self.service_delete_events
+            | self.service_upsert_events
+            | self.service_delete_events
         )
 
     @property
@@ -1,13 +1,16 @@
 import typing
-from typing import Any
+from typing import Any, Awaitable, Callable
 import asyncio
+import contextvars
 
+import orjson
+from fastapi import HTTPException, Request
 from loguru import logger
 
 from clients.pagerduty import PagerDutyClient
 from integration import ObjectKind, PagerdutyServiceResourceConfig
 from integration import PagerdutyIncidentResourceConfig, PagerdutyScheduleResourceConfig
-from port_ocean.context.event import event
+from port_ocean.context.event import event, event_context, EventType
 from port_ocean.context.ocean import ocean
 from port_ocean.core.ocean_types import ASYNC_GENERATOR_RESYNC_TYPE
 
@@ -120,35 +123,185 @@ async def on_schedules_resync(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
         yield schedules
 
 
-@ocean.router.post("/webhook")
-async def upsert_incident_webhook_handler(data: dict[str, Any]) -> None:
+async def handle_service_delete_events(
+    pager_duty_client: PagerDutyClient, events: list[dict[str, Any]]
+) -> None:
+    await ocean.unregister_raw(
+        ObjectKind.SERVICES, [webhook_event["data"] for webhook_event in events]
+    )
+
+
+async def fetch_webhook_events_resources(
+    pager_duty_client: PagerDutyClient, object_type: str, events: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    identifiers = [webhook_event["data"]["id"] for webhook_event in events]
+    responses = await asyncio.gather(
+        *[
+            pager_duty_client.get_singular_from_pager_duty(
+                object_type=object_type, identifier=identifier
+            )
+            for identifier in identifiers
+        ],
+        return_exceptions=True,
+    )
+
+    resources: list[dict[str, Any]] = []
+    for identifier, response in zip(identifiers, responses):
+        if isinstance(response, BaseException):
+            logger.error(
+                f"Failed to fetch {object_type} {identifier} for webhook event: {response}"
+            )
+        else:
+            resources.append(response)
+    return resources
+
+
+async def handle_incident_upsert_events(
+    pager_duty_client: PagerDutyClient, events: list[dict[str, Any]]
+) -> None:
+    responses = await fetch_webhook_events_resources(
+        pager_duty_client, ObjectKind.INCIDENTS, events
+    )
+    if not responses:
+        return
+
+    enriched_incidents = await enrich_incidents_with_analytics_data(
+        pager_duty_client, [response["incident"] for response in responses]
+    )
+    await ocean.register_raw(ObjectKind.INCIDENTS, enriched_incidents)
+
+
+async def handle_service_upsert_events(
+    pager_duty_client: PagerDutyClient, events: list[dict[str, Any]]
+) -> None:
+    responses = await fetch_webhook_events_resources(
+        pager_duty_client, ObjectKind.SERVICES, events
+    )
+    if not responses:
+        return
+
+    services = await pager_duty_client.update_oncall_users(
+        [response["service"] for response in responses]
+    )
+
+    await ocean.register_raw(ObjectKind.SERVICES, services)
+
+
+WebhookEventsHandler = Callable[
+    [PagerDutyClient, list[dict[str, Any]]], Awaitable[None]
+]
+
+WEBHOOK_EVENTS_HANDLERS: dict[str, WebhookEventsHandler] = {
+    **dict.fromkeys(
+        PagerDutyClient.service_delete_events, handle_service_delete_events
+    ),
+    **dict.fromkeys(
+        PagerDutyClient.incident_upsert_events, handle_incident_upsert_events
+    ),
+    **dict.fromkeys(
+        PagerDutyClient.service_upsert_events, handle_service_upsert_events
+    ),
+}
+
+# Incident events come in bursts (an incident is triggered, acknowledged, escalated and annotated within seconds), so
+# they are queued and handled in batches, and each resource is fetched from PagerDuty and registered once per batch.
+# PagerDuty retries a delivery that gets a 503 when the queue is full. Events still queued when the integration shuts
+# down are lost, until the next resync picks up their changes.
+WEBHOOK_EVENTS_BATCH_MAX_SIZE = 100
+WEBHOOK_EVENTS_BATCH_MAX_WAIT_SECONDS = 1.0
+WEBHOOK_EVENTS_MAX_QUEUED = 1000
+webhook_events_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+    maxsize=WEBHOOK_EVENTS_MAX_QUEUED
+)
+# the event loop holds tasks weakly, this is the only strong reference to the processor
+webhook_events_processor: asyncio.Task[None] | None = None
+
+
+async def collect_webhook_events_batch() -> list[dict[str, Any]]:
+    events = [await webhook_events_queue.get()]
+    deadline = asyncio.get_running_loop().time() + WEBHOOK_EVENTS_BATCH_MAX_WAIT_SECONDS
+
+    while len(events) < WEBHOOK_EVENTS_BATCH_MAX_SIZE:
+        timeout = deadline - asyncio.get_running_loop().time()
+        if timeout <= 0:
+            break
+        try:
+            events.append(
+                await asyncio.wait_for(webhook_events_queue.get(), timeout=timeout)
+            )
+        except asyncio.TimeoutError:
+            break
+
+    return events
+
+
+async def handle_webhook_events_batch(events: list[dict[str, Any]]) -> None:
+    # only the latest event of each resource is processed, as it reflects its most recent state
+    latest_events: dict[tuple[str, str], dict[str, Any]] = {}
+    for webhook_event in events:
+        try:
+            resource_type = webhook_event["event_type"].split(".")[0]
+            resource_key = (resource_type, webhook_event["data"]["id"])
+        except (KeyError, TypeError):
+            logger.error(f"Skipping malformed Pagerduty webhook event: {webhook_event}")
+            continue
+        latest_events.pop(resource_key, None)
+        latest_events[resource_key] = webhook_event
+
+    events_by_handler: dict[WebhookEventsHandler, list[dict[str, Any]]] = {}
+    for webhook_event in latest_events.values():
+        if handler := WEBHOOK_EVENTS_HANDLERS.get(webhook_event["event_type"]):
+            events_by_handler.setdefault(handler, []).append(webhook_event)
+
     pager_duty_client = initialize_client()
-    event_type = data["event"]["event_type"]
-    logger.info(f"Processing Pagerduty webhook for event type: {event_type}")
+    for handler, handler_events in events_by_handler.items():
+        try:
+            await handler(pager_duty_client, handler_events)
+        except Exception:
+            logger.exception(
+                f"Failed to process {len(handler_events)} Pagerduty webhook events with {handler.__name__}"
+            )
 
-    if event_type in pager_duty_client.service_delete_events:
-        await ocean.unregister_raw(ObjectKind.SERVICES, [data["event"]["data"]])
 
-    elif event_type in pager_duty_client.incident_upsert_events:
-        incident_id = data["event"]["data"]["id"]
+async def process_webhook_events() -> None:
+    while True:
+        events = await collect_webhook_events_batch()
+        logger.info(f"Processing batch of {len(events)} Pagerduty webhook events")
+        try:
+            async with event_context(EventType.HTTP_REQUEST, trigger_type="request"):
+                await handle_webhook_events_batch(events)
+        except Exception:
+            logger.exception("Failed to process Pagerduty webhook events batch")
 
-        incident = await pager_duty_client.get_singular_from_pager_duty(
-            object_type=ObjectKind.INCIDENTS, identifier=incident_id
-        )
 
-        enriched_incident = await enrich_incidents_with_analytics_data(
-            pager_duty_client, [incident["incident"]]
+@ocean.router.post("/webhook")
+async def upsert_incident_webhook_handler(request: Request) -> None:
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=400, detail="Pagerduty webhook body is not valid JSON"
         )
-        await ocean.register_raw(ObjectKind.INCIDENTS, enriched_incident)
-
-    elif event_type in pager_duty_client.service_upsert_events:
-        service_id = data["event"]["data"]["id"]
-        response = await pager_duty_client.get_singular_from_pager_duty(
-            object_type=ObjectKind.SERVICES, identifier=service_id
+    try:
+        event_type = data["event"]["event_type"]
+    except (KeyError, TypeError):
+        raise HTTPException(
+            status_code=422, detail="Pagerduty webhook body has no event type"
         )
-        services = await pager_duty_client.update_oncall_users([response["service"]])
+    logger.info(f"Received Pagerduty webhook for event type: {event_type}")
 
-        await ocean.register_raw(ObjectKind.SERVICES, services)
+    if event_type not in WEBHOOK_EVENTS_HANDLERS:
+        return
+
+    try:
+        webhook_events_queue.put_nowait(data["event"])
+    except asyncio.QueueFull:
+        logger.warning(
+            f"{WEBHOOK_EVENTS_MAX_QUEUED} Pagerduty webhook events are already queued, asking PagerDuty to retry {event_type}"
+        )
+        raise HTTPException(
+            status_code=503, detail="Pagerduty webhook events queue is full"
+        )
 
 
 @ocean.on_start()
@@ -157,6 +310,13 @@ async def on_start() -> None:
         logger.info("Skipping webhook creation because the event listener is ONCE")
         return
 
+    # on_start runs inside the START event, which has no port app config. A task inherits the context it is created in,
+    # so the processor gets an empty one, otherwise every batch's event context would inherit from the START event
+    global webhook_events_processor
+    webhook_events_processor = asyncio.create_task(
+        process_webhook_events(), context=contextvars.Context()
+    )
+
     pager_duty_client = initialize_client()
     logger.info("Subscribing to Pagerduty webhooks")
     await pager_duty_client.create_webhooks_if_not_exists()
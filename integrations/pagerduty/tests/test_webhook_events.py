@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import APIRouter, HTTPException, Request
+from port_ocean.context.event import event_context, EventType
+from port_ocean.context.ocean import ocean
+
+
+@pytest.fixture
+def app() -> Iterator[MagicMock]:
+    app = MagicMock()
+    app.integration_router = APIRouter()
+    app.integration.on_resync = lambda function, kind: function
+    app.integration.on_start = lambda function: function
+    app.integration.register_raw = AsyncMock()
+    app.integration.unregister_raw = AsyncMock()
+    app.config.event_listener.type = "WEBHOOK"
+    with patch.object(ocean, "_app", app):
+        yield app
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    client = MagicMock()
+    client.create_webhooks_if_not_exists = AsyncMock()
+    client.get_singular_from_pager_duty = AsyncMock(
+        return_value={"incident": {"id": "P1"}}
+    )
+    client.get_incident_analytics = AsyncMock(return_value={"meanSecondsToResolve": 1})
+    return client
+
+
+async def _process_webhook_events(app: MagicMock, events: list[dict[str, Any]]) -> None:
+    import main
+
+    # ocean runs the on_start listeners inside the START event, which has no port app config
+    async with event_context(EventType.START, trigger_type="machine"):
+        await main.on_start()
+
+    for webhook_event in events:
+        main.webhook_events_queue.put_nowait(webhook_event)
+
+    async def wait_for_registration() -> None:
+        while not (
+            app.integration.register_raw.await_count
+            and app.integration.unregister_raw.await_count
+        ):
+            await asyncio.sleep(0.1)
+
+    await asyncio.wait_for(wait_for_registration(), timeout=5)
+
+    assert main.webhook_events_processor is not None
+    main.webhook_events_processor.cancel()
+    await asyncio.gather(main.webhook_events_processor, return_exceptions=True)
+
+
+def test_queued_webhook_events_are_registered(
+    app: MagicMock, client: MagicMock
+) -> None:
+    import main
+
+    events = [
+        {"event_type": "incident.triggered", "data": {"id": "P1"}},
+        {"event_type": "service.deleted", "data": {"id": "S1"}},
+    ]
+    with patch.object(main, "initialize_client", return_value=client):
+        asyncio.run(_process_webhook_events(app, events))
+
+    register_args = app.integration.register_raw.await_args.args
+    assert register_args[:2] == (
+        "incidents",
+        [{"id": "P1", "__analytics": {"meanSecondsToResolve": 1}}],
+    )
+    unregister_args = app.integration.unregister_raw.await_args.args
+    assert unregister_args[:2] == ("services", [{"id": "S1"}])
+
+
+def _webhook_request(body: bytes) -> Request:
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+@pytest.mark.parametrize(
+    "body, status_code",
+    [(b"{", 400), (b"[]", 422), (b'"event"', 422), (b'{"event": {}}', 422)],
+)
+def test_malformed_webhook_is_rejected(
+    app: MagicMock, body: bytes, status_code: int
+) -> None:
+    import main
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(main.upsert_incident_webhook_handler(_webhook_request(body)))
+
+    assert error.value.status_code == status_code
+    assert main.webhook_events_queue.empty()
@@ -1,7 +1,11 @@
+import hmac
 from enum import StrEnum
-from typing import Any
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Callable
 
-from fastapi import Depends, HTTPException
+import orjson
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer
 from loguru import logger
 
@@ -17,6 +21,8 @@ class ObjectKind(StrEnum):
     CONTROL = "control"
 
 
+# the client is shared between resyncs and webhooks so its access token is reused until it expires
+@lru_cache(maxsize=1)
 def init_client() -> WizClient:
     return WizClient(
         ocean.integration_config["wiz_api_url"],
@@ -26,6 +32,34 @@ def init_client() -> WizClient:
     )
 
 
+IssuesExtractor = Callable[[list[dict[str, Any]]], list[dict[str, Any]]]
+
+
+def _extract_issues(issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return issues
+
+
+def _extract_controls(issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        source_rule
+        for issue in issues
+        if (source_rule := issue.get("sourceRule")) is not None
+    ]
+
+
+def _extract_service_tickets(issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return list(
+        chain.from_iterable(issue.get("serviceTickets") or () for issue in issues)
+    )
+
+
+ISSUES_EXTRACTORS: dict[str, IssuesExtractor] = {
+    ObjectKind.ISSUE: _extract_issues,
+    ObjectKind.CONTROL: _extract_controls,
+    ObjectKind.SERVICE_TICKET: _extract_service_tickets,
+}
+
+
 @ocean.on_resync()
 async def on_resync(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
     wiz_client = init_client()
@@ -34,30 +68,36 @@ async def on_resync(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
         async for projects in wiz_client.get_projects():
             logger.info(f"Received {len(projects)} projects")
             yield projects
-    else:
+    elif extract := ISSUES_EXTRACTORS.get(kind):
         async for _issues in wiz_client.get_issues():
             logger.info(f"Received {len(_issues)} issues")
-            if kind == ObjectKind.ISSUE:
-                yield _issues
-            elif kind == ObjectKind.CONTROL:
-                yield [
-                    issue["sourceRule"]
-                    for issue in _issues
-                    if issue.get("sourceRule") is not None
-                ]
-            elif kind == ObjectKind.SERVICE_TICKET:
-                yield [
-                    ticket
-                    for issue in _issues
-                    for ticket in issue.get("serviceTickets", [])
-                ]
+            yield extract(_issues)
+
+
+async def _read_webhook_payload(request: Request) -> dict[str, Any]:
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail={"ok": False, "message": "Wiz webhook body is not valid JSON"},
+        )
+    if not isinstance(data, dict) or not isinstance(data.get("issue"), dict):
+        raise HTTPException(
+            status_code=422,
+            detail={"ok": False, "message": "Wiz webhook body has no issue object"},
+        )
+    return data
 
 
 @ocean.router.post("/webhook")
 async def handle_webhook_request(
-    data: dict[str, Any], token: Any = Depends(HTTPBearer())
+    request: Request, token: Any = Depends(HTTPBearer())
 ) -> dict[str, Any]:
-    if ocean.integration_config["wiz_webhook_verification_token"] != token.credentials:
+    expected_token = ocean.integration_config.get("wiz_webhook_verification_token")
+    if not expected_token or not hmac.compare_digest(
+        expected_token.encode(), token.credentials.encode()
+    ):
         raise HTTPException(
             status_code=401,
             detail={
@@ -66,6 +106,7 @@ async def handle_webhook_request(
             },
         )
 
+    data = await _read_webhook_payload(request)
     logger.info(f"Received webhook request: {data}")
     wiz_client = init_client()
 
@@ -11,7 +11,12 @@ _http_client: LocalStack[httpx.AsyncClient] = LocalStack()
 def _get_http_client_context() -> httpx.AsyncClient:
     client = _http_client.top
     if client is None:
-        client = OceanAsyncClient(RetryTransport, timeout=ocean.config.client_timeout)
+        client = OceanAsyncClient(
+            RetryTransport,
+            timeout=ocean.config.client_timeout,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+        )
         _http_client.push(client)
 
     return client
@@ -21,6 +26,8 @@ def _get_http_client_context() -> httpx.AsyncClient:
 Utilize this client for all outbound integration requests to the third-party application. It functions as a wrapper 
 around the httpx.AsyncClient, incorporating retry logic at the transport layer for handling retries on 5xx errors and
 connection errors.
+The client negotiates HTTP/2 when the server supports it, so concurrent requests to the same host are multiplexed over a
+single connection, and otherwise keeps the HTTP/1.1 connections alive for reuse.
 
 The client is instantiated lazily, only coming into existence upon its initial access. It should not be closed when in
 use, as it operates as a singleton shared across all events in the thread. It also takes care of recreating the client